@@ -21,80 +21,208 @@ Table spec:
 - Σ totals, Δ differences (+/-)
 
 Storage:
-- Per channel/thread, saved to SCOREBOARD_PATH or ./scoreboards.json
+- One JSON file per channel/thread under SCOREBOARD_DIR (default: scoreboards/ next to SCOREBOARD_PATH)
+- A legacy SCOREBOARD_PATH (./scoreboards.json) is split into per-board files on startup
+- SCOREBOARD_DURABLE=1 makes every write atomic (tmp + fsync + rename); by default files are
+  overwritten in place and checkpointed atomically at exit
+- Changes are written back in the background (debounced by FLUSH_DELAY) and flushed at exit (incl. SIGTERM)
 """
 
 from __future__ import annotations
 import os
 import json
+import asyncio
+import atexit
+import signal
+import time
 try:
     from dotenv import load_dotenv
     load_dotenv()  # Load environment variables from .env if present
 except ImportError:
     pass  # python-dotenv not installed; skip .env loading
-from dataclasses import dataclass, field, asdict
+try:
+    import orjson  # faster (de)serialization when available
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    _loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+except ImportError:
+    def _dumps(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    _loads = json.loads
+from array import array
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 
 import discord
 from discord import app_commands
 
-DATA_PATH = os.environ.get("SCOREBOARD_PATH", "scoreboards.json")
+DATA_PATH = os.environ.get("SCOREBOARD_PATH", "scoreboards.json")  # legacy single-file store
+# Default to a directory next to the legacy file so existing deployments (e.g. a volume) keep their data.
+DATA_DIR = os.environ.get("SCOREBOARD_DIR") or os.path.join(os.path.dirname(DATA_PATH) or ".", "scoreboards")
+FLUSH_DELAY = 1.0  # seconds to wait after a change so bursts coalesce into one write
+# SCOREBOARD_DURABLE=1: every save is tmp + fsync + os.replace. Otherwise boards are
+# overwritten in place and only checkpointed that way at exit (data is easy to rebuild).
+DURABLE = os.environ.get("SCOREBOARD_DURABLE", "").lower() in ("1", "true", "yes")
+EDIT_INTERVAL = 1.0  # min seconds between edits of a board message (Discord allows ~5 edits / 5s)
 
 # ------------------ Persistence ------------------
 
-def _load_all() -> Dict[str, dict]:
-    if not os.path.exists(DATA_PATH):
-        return {}
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
+# One file per board: DATA_DIR/<guild>_<channel>_<thread>.json (":" is not allowed on Windows)
+def _path(key: str) -> str:
+    return os.path.join(DATA_DIR, key.replace(":", "_") + ".json")
+
+def _load_one(key: str) -> Optional[dict]:
+    try:
+        with open(_path(key), "rb") as f:
+            return _loads(f.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
 
-def _save_all(data: Dict[str, dict]):
-    tmp = DATA_PATH + ".tmp"
-    os.makedirs(os.path.dirname(DATA_PATH) or ".", exist_ok=True)
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    os.replace(tmp, DATA_PATH)
+_unsynced: set = set()  # keys overwritten in place since the last checkpoint
+
+def _save_one(key: str, data: dict, durable: bool = DURABLE):
+    path = _path(key)
+    target = path + ".tmp" if durable else path
+    try:
+        f = open(target, "wb")
+    except FileNotFoundError:  # DATA_DIR not created yet
+        os.makedirs(DATA_DIR, exist_ok=True)
+        f = open(target, "wb")
+    with f:
+        f.write(_dumps(data))
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    if durable:
+        os.replace(target, path)
+        _unsynced.discard(key)
+    else:
+        _unsynced.add(key)
+
+def _delete_one(key: str):
+    try:
+        os.remove(_path(key))
+    except FileNotFoundError:
+        pass
+
+def _load_keys() -> List[str]:
+    try:
+        names = os.listdir(DATA_DIR)
+    except FileNotFoundError:
+        return []
+    return [name[:-5].replace("_", ":") for name in names if name.endswith(".json")]
+
+def _migrate_legacy():
+    """Split a legacy scoreboards.json into per-board files (one-shot)."""
+    try:
+        with open(DATA_PATH, "rb") as f:
+            data = _loads(f.read())
+    except FileNotFoundError:
+        return
+    except json.JSONDecodeError:
+        data = {}
+    for k, d in data.items():
+        _save_one(k, d, durable=True)  # the legacy file is renamed away right after
+    os.replace(DATA_PATH, DATA_PATH + ".migrated")
+
+def _write_changes(changes: Dict[str, Optional[dict]]):
+    """Persist dirty boards; None means the board was deleted."""
+    for k, d in changes.items():
+        if d is None:
+            _delete_one(k)
+        else:
+            _save_one(k, d)
 
 # Key = f"{guild_id}:{channel_id}:{thread_id_or_0}"
+# Computed once per interaction and kept in Interaction.extras (get_board + save_board both need it).
 def _key(ctx: discord.Interaction) -> str:
-    guild_id = ctx.guild_id or 0
-    channel = ctx.channel
-    thread_id = channel.id if isinstance(channel, discord.Thread) else 0
-    parent_id = channel.parent_id if isinstance(channel, discord.Thread) else channel.id
-    channel_id = parent_id
-    return f"{guild_id}:{channel_id}:{thread_id}"
+    k = ctx.extras.get("sb_key")
+    if k is None:
+        ch = ctx.channel
+        if isinstance(ch, discord.Thread):
+            cid, tid = ch.parent_id, ch.id
+        else:
+            cid, tid = ch.id, 0
+        k = ctx.extras["sb_key"] = f"{ctx.guild_id or 0}:{cid}:{tid}"
+    return k
 
 # ------------------ Model ------------------
 
-@dataclass
-class Round:
-    a: int
-    b: int
-
-@dataclass
+# 表示仕様: RND列は幅5、各プレイヤー列は幅10（" " + 8 content + " "）。
+# 全セルは右詰め + 末尾スペース1つなので、1行を1つのテンプレートで書ける。
+# プレイヤー列 a / b には _ply_cell / _score_cell で整形済みのセルを渡す。
+COL_RND = 5
+COL_PLY = 10
+HLINE = "+" + "-" * COL_RND + "+" + "-" * COL_PLY + "+" + "-" * COL_PLY + "+\n"
+ROW_TMPL = f"|{{rnd:>{COL_RND - 1}}} |{{a}}|{{b}}|\n"
+
+def _label_tmpl(label: str) -> str:
+    # ROW_TMPL with the RND cell already filled in
+    return f"|{label:>{COL_RND - 1}} |{{a}}|{{b}}|\n"
+
+HEADER_TMPL = _label_tmpl("RND")
+SUM_TMPL = _label_tmpl("Σ")
+DIFF_TMPL = _label_tmpl("Δ")
+
+def _ply_cell(s: str) -> str:
+    return f"{s:>{COL_PLY - 1}} "
+
+# Formatted score cells, keyed by (value, zero_as_dash) / value; scores repeat a lot.
+_CELL_CACHE: Dict[tuple, str] = {}
+_SIGNED_CACHE: Dict[int, str] = {}
+_CELL_CACHE_MAX = 4096
+
+def _score_cell(x: int, dash: bool) -> str:
+    key = (x, dash)
+    c = _CELL_CACHE.get(key)
+    if c is None:
+        if len(_CELL_CACHE) >= _CELL_CACHE_MAX:
+            _CELL_CACHE.clear()
+        c = _CELL_CACHE[key] = _ply_cell(str(x) if x else ("-" if dash else "0"))
+    return c
+
+# Δ行は常に±付き（+0 / -0 はそのまま）
+def _signed_cell(x: int) -> str:
+    c = _SIGNED_CACHE.get(x)
+    if c is None:
+        if len(_SIGNED_CACHE) >= _CELL_CACHE_MAX:
+            _SIGNED_CACHE.clear()
+        c = _SIGNED_CACHE[x] = _ply_cell(f"{x:+d}")
+    return c
+
+@dataclass(slots=True)
 class Board:
     title: str
     player_a: str
     player_b: str
-    rounds: List[Round] = field(default_factory=list)
+    # rounds stored column-wise: round i is (rounds_a[i], rounds_b[i])
+    rounds_a: array = field(default_factory=lambda: array("q"))
+    rounds_b: array = field(default_factory=lambda: array("q"))
+    ta: int = 0  # running totals, kept in sync by the mutating commands
+    tb: int = 0
     message_id: Optional[int] = None  # message to edit
 
-    # 表示仕様
-    COL_RND: int = 5
-    COL_PLY: int = 10  # " " + 8 content + " "
+    # 表示仕様（列幅はモジュール定数 COL_RND / COL_PLY で固定）
     zero_as_dash: bool = True  # True: 0を"-"表示 / False: "0"表示
 
+    # render() cache (not persisted); cleared by invalidate() on every mutation
+    _rendered: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _render_key: tuple = field(default=(), init=False, repr=False, compare=False)
+    _header_line: Optional[str] = field(default=None, init=False, repr=False, compare=False)  # reset on rename
+
+    # debounced message edits (see schedule_edit)
+    _dirty_render: bool = field(default=False, init=False, repr=False, compare=False)
+    _pending_render_task: Optional[asyncio.Task] = field(default=None, init=False, repr=False, compare=False)
+    _last_edit_ts: float = field(default=0.0, init=False, repr=False, compare=False)
+    _last_sent_content: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def invalidate(self):
+        self._rendered = None
+
     # ---- formatting helpers ----
     @staticmethod
     def _is_ascii(s: str) -> bool:
-        try:
-            s.encode("ascii")
-            return True
-        except UnicodeEncodeError:
-            return False
+        return s.isascii()
 
     @classmethod
     def _validate_name(cls, name: Optional[str]) -> Optional[str]:
@@ -106,78 +234,87 @@ class Board:
 
     # ---- render ----
     def totals(self):
-        ta = sum(r.a for r in self.rounds)
-        tb = sum(r.b for r in self.rounds)
-        return ta, tb
+        return self.ta, self.tb
+
+    def _cache_key(self) -> tuple:
+        last = (self.rounds_a[-1], self.rounds_b[-1]) if self.rounds_a else None
+        return (self.title, self.player_a, self.player_b, self.zero_as_dash, len(self.rounds_a), last)
 
     def render(self) -> str:
         """Return a code-block string of the scoreboard in fixed layout."""
-        COL_RND = self.COL_RND
-        COL_PLY = self.COL_PLY
-
-        def hline() -> str:
-            return "+" + "-" * COL_RND + "+" + "-" * COL_PLY + "+" + "-" * COL_PLY + "+\n"
-
-        # 名前: ASCII前提, 8文字右詰め, 両端スペースで幅10
-        def fmt_name(name: str) -> str:
-            safe = name.encode("ascii", "ignore").decode("ascii")
-            s = safe[:8].rjust(8)
-            return f" {s} "
-
-        # RNDセル: 幅5、右詰め + 末尾スペース
-        def fmt_rnd(text: str) -> str:
-            return f"{text:>{COL_RND-1}} "
-
-        # スコア: 右詰め + 末尾スペース / 0の見た目はフラグで切替
-        def fmt_score_val(x: int) -> str:
-            if x == 0:
-                s = "-" if self.zero_as_dash else "0"
-            else:
-                s = str(x)
-            return f"{s:>{COL_PLY-1}} "
-
-        # Δ行は常に±付き（+0 / -0 はそのまま）
-        def fmt_score_signed(x: int) -> str:
-            s = f"{x:+d}"
-            return f"{s:>{COL_PLY-1}} "
-
-        ta, tb = self.totals()
+        key = self._cache_key()
+        if self._rendered is None or key != self._render_key:
+            self._rendered = self._render()
+            self._render_key = key
+        return self._rendered
+
+    def _render(self) -> str:
+        dash = self.zero_as_dash  # 0の見た目はフラグで切替
+        ta, tb = self.ta, self.tb  # running totals: no pass over the rounds needed
         diff = ta - tb
 
-        header = f"|{fmt_rnd('RND')}|{fmt_name(self.player_a)}|{fmt_name(self.player_b)}|\n"
-
-        body_lines = []
-        for i, r in enumerate(self.rounds, start=1):
-            body_lines.append(f"|{fmt_rnd(str(i))}|{fmt_score_val(r.a)}|{fmt_score_val(r.b)}|")
-        body = ("\n".join(body_lines) + "\n") if body_lines else ""
-
-        footer = (
-            f"|{fmt_rnd('Σ')}|{fmt_score_val(ta)}|{fmt_score_val(tb)}|\n"
-            f"|{fmt_rnd('Δ')}|{fmt_score_signed(+diff)}|{fmt_score_signed(-diff)}|\n"
+        # 名前: _validate_name でASCII保証済み, 8文字右詰め（両端スペースはテンプレート側）
+        if self._header_line is None:
+            self._header_line = HEADER_TMPL.format(a=_ply_cell(self.player_a[:8]), b=_ply_cell(self.player_b[:8]))
+        parts: List[str] = [HLINE, self._header_line, HLINE]
+        parts.extend(
+            ROW_TMPL.format(rnd=i, a=_score_cell(a, dash), b=_score_cell(b, dash))
+            for i, (a, b) in enumerate(zip(self.rounds_a, self.rounds_b), start=1)
         )
+        parts.append(HLINE)
+        parts.append(SUM_TMPL.format(a=_score_cell(ta, dash), b=_score_cell(tb, dash)))
+        parts.append(DIFF_TMPL.format(a=_signed_cell(diff), b=_signed_cell(-diff)))
+        parts.append(HLINE)
 
-        table = hline() + header + hline() + body + hline() + footer + hline()
         title = f"【{self.title}】 {self.player_a} vs {self.player_b}"
-        return f"**{title}**\n```\n{table}```"
+        return f"**{title}**\n```\n" + "".join(parts) + "```"
 
     @classmethod
     def from_dict(cls, d: dict) -> "Board":
-        rounds = [Round(**r) for r in d.get("rounds", [])]
+        if "rounds_a" in d:
+            rounds_a = array("q", d["rounds_a"])
+            rounds_b = array("q", d.get("rounds_b", []))
+            sa = sb = None
+        else:  # legacy: list of {"a": .., "b": ..}; one pass fills both columns and the sums
+            rounds_a, rounds_b = array("q"), array("q")
+            sa = sb = 0
+            for r in d.get("rounds", []):
+                a, b = r["a"], r["b"]
+                rounds_a.append(a)
+                rounds_b.append(b)
+                sa += a
+                sb += b
+        if "ta" in d and "tb" in d:
+            ta, tb = d["ta"], d["tb"]
+        elif sa is not None:
+            ta, tb = sa, sb
+        else:  # saved before running totals existed
+            ta = sum(rounds_a)
+            tb = sum(rounds_b)
         return cls(
             title=d.get("title", "Scoreboard"),
             player_a=d.get("player_a", "PlayerA"),
             player_b=d.get("player_b", "PlayerB"),
-            rounds=rounds,
+            rounds_a=rounds_a,
+            rounds_b=rounds_b,
+            ta=ta,
+            tb=tb,
             message_id=d.get("message_id"),
-            COL_RND=d.get("COL_RND", 5),
-            COL_PLY=d.get("COL_PLY", 10),
             zero_as_dash=d.get("zero_as_dash", True),
         )
 
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d["rounds"] = [asdict(r) for r in self.rounds]
-        return d
+        return {
+            "title": self.title,
+            "player_a": self.player_a,
+            "player_b": self.player_b,
+            "rounds_a": self.rounds_a.tolist(),
+            "rounds_b": self.rounds_b.tolist(),
+            "ta": self.ta,
+            "tb": self.tb,
+            "message_id": self.message_id,
+            "zero_as_dash": self.zero_as_dash,
+        }
 
 # ------------------ Bot ------------------
 
@@ -185,17 +322,150 @@ intents = discord.Intents.default()
 client = discord.Client(intents=intents)
 tree = app_commands.CommandTree(client)
 
+# In-memory cache: key -> Board. Populated once from DATA_DIR, then mutated in place.
+_BOARDS: Dict[str, Board] = {}
+# Last serialized form of each board (what the flusher writes); replaced whole on save, never mutated.
+_RAW: Dict[str, dict] = {}
+_loaded = False
+
+def _ensure_loaded():
+    global _loaded
+    if _loaded:
+        return
+    _migrate_legacy()
+    for k in _load_keys():
+        d = _load_one(k)
+        if d is not None:
+            _RAW[k] = d
+            _BOARDS[k] = Board.from_dict(d)
+    _loaded = True
+
+# Write-back: mutations only mark keys dirty; a background task flushes them.
+_dirty: set = set()
+_flush_event: Optional[asyncio.Event] = None
+_flush_lock: Optional[asyncio.Lock] = None
+_flush_task: Optional[asyncio.Task] = None
+
+def _snapshot(keys) -> Dict[str, Optional[dict]]:
+    return {k: _RAW.get(k) for k in keys}
+
+def _flush_sync():
+    """Write pending changes immediately (used before the flusher runs and at exit)."""
+    if not _dirty:
+        return
+    keys = set(_dirty)
+    _dirty.clear()
+    _write_changes(_snapshot(keys))
+
+async def _flush():
+    async with _flush_lock:
+        if not _dirty:
+            return
+        keys = set(_dirty)
+        _dirty.clear()
+        try:
+            snapshot = _snapshot(keys)  # dicts in _RAW are never mutated, so the executor can dump them as-is
+            await asyncio.get_running_loop().run_in_executor(None, _write_changes, snapshot)
+        except Exception as e:  # keep the writer alive; retry these keys on the next pass
+            _dirty.update(keys)
+            _flush_event.set()
+            print("Save error:", e)
+
+async def _flush_loop():
+    while True:
+        await _flush_event.wait()
+        await asyncio.sleep(FLUSH_DELAY)
+        _flush_event.clear()
+        await _flush()
+
+def _start_flusher():
+    global _flush_event, _flush_lock, _flush_task
+    if _flush_task is not None:
+        return
+    _flush_event = asyncio.Event()
+    _flush_lock = asyncio.Lock()
+    _flush_task = asyncio.create_task(_flush_loop())
+    if _dirty:
+        _flush_event.set()
+
+def _mark_dirty(k: str):
+    _dirty.add(k)
+    if _flush_event is None:
+        _flush_sync()
+    else:
+        _flush_event.set()
+
+def _checkpoint():
+    """Rewrite boards saved in place since the last checkpoint atomically (tmp + fsync + replace)."""
+    for k in list(_unsynced):
+        d = _RAW.get(k)
+        if d is not None:
+            _save_one(k, d, durable=True)
+    _unsynced.clear()
+
+def _shutdown():
+    _flush_sync()
+    _checkpoint()
+
+atexit.register(_shutdown)
+
 def get_board(inter: discord.Interaction) -> Optional[Board]:
-    data = _load_all()
-    k = _key(inter)
-    if k in data:
-        return Board.from_dict(data[k])
-    return None
+    _ensure_loaded()
+    return _BOARDS.get(_key(inter))
+
+def _store(k: str, board: Board):
+    _BOARDS[k] = board
+    _RAW[k] = board.to_dict()
+    _mark_dirty(k)
 
 def save_board(inter: discord.Interaction, board: Board):
-    data = _load_all()
-    data[_key(inter)] = board.to_dict()
-    _save_all(data)
+    _ensure_loaded()
+    _store(_key(inter), board)
+
+def drop_board(inter: discord.Interaction):
+    _ensure_loaded()
+    k = _key(inter)
+    _RAW.pop(k, None)
+    if _BOARDS.pop(k, None) is not None:
+        _mark_dirty(k)
+
+def schedule_edit(inter: discord.Interaction, board: Board):
+    """Queue a re-render of the board message; changes within EDIT_INTERVAL share one edit."""
+    task = board._pending_render_task
+    idle = task is None or task.done()
+    if idle and board.render() == board._last_sent_content:
+        return  # nothing visible changed (e.g. same zero style again)
+    board._dirty_render = True
+    if idle:
+        board._pending_render_task = asyncio.create_task(_edit_message(inter.channel, _key(inter), board))
+
+async def _edit_message(channel, k: str, board: Board):
+    while board._dirty_render:
+        delay = EDIT_INTERVAL - (time.monotonic() - board._last_edit_ts)
+        if delay > 0:
+            await asyncio.sleep(delay)
+            if not board._dirty_render:  # withdrawn by /board_delete while waiting
+                break
+        board._dirty_render = False  # later changes during the edit trigger another pass
+        content = board.render()
+        if content == board._last_sent_content:
+            continue
+        try:
+            await channel.get_partial_message(board.message_id).edit(content=content)
+        except discord.NotFound:
+            try:
+                msg = await channel.send(content)
+            except discord.HTTPException as e:
+                print("Send error:", e)
+                continue
+            board.message_id = msg.id
+            if _BOARDS.get(k) is board:
+                _store(k, board)
+        except discord.HTTPException as e:
+            print("Edit error:", e)
+            continue
+        board._last_sent_content = content
+        board._last_edit_ts = time.monotonic()
 
 # ---- Commands ----
 
@@ -219,13 +489,14 @@ async def board_start(inter: discord.Interaction, player_a: str, player_b: str,
         return
 
     existing = get_board(inter)
-    if existing and (existing.rounds or existing.message_id):
+    if existing and (existing.rounds_a or existing.message_id):
         await inter.followup.send("既にボードがあります。/board_show で確認、/board_reset で初期化できます。", ephemeral=True)
         return
 
-    board = Board(title=title or "戦績ボード", player_a=va, player_b=vb, rounds=[])
+    board = Board(title=title or "戦績ボード", player_a=va, player_b=vb)
     msg = await inter.channel.send(board.render())
     board.message_id = msg.id
+    board._last_sent_content = board.render()
     save_board(inter, board)
     await inter.followup.send("ボードを作成しました！以後は /board_add でラウンドを追加できます。", ephemeral=True)
 
@@ -237,15 +508,14 @@ async def board_add(inter: discord.Interaction, a: int = 0, b: int = 0):
     if not board or not board.message_id:
         await inter.followup.send("先に /board_start でボードを作成してください。", ephemeral=True)
         return
-    board.rounds.append(Round(a=a, b=b))
-    try:
-        msg = await inter.channel.fetch_message(board.message_id)
-        await msg.edit(content=board.render())
-    except discord.NotFound:
-        msg = await inter.channel.send(board.render())
-        board.message_id = msg.id
+    board.rounds_a.append(a)
+    board.rounds_b.append(b)
+    board.ta += a
+    board.tb += b
+    board.invalidate()
+    schedule_edit(inter, board)
     save_board(inter, board)
-    await inter.followup.send(f"追加: RND {len(board.rounds)}  A={a}  B={b}", ephemeral=True)
+    await inter.followup.send(f"追加: RND {len(board.rounds_a)}  A={a}  B={b}", ephemeral=True)
 
 @tree.command(name="board_edit", description="Edit an existing round score by its number")
 @app_commands.describe(
@@ -256,42 +526,41 @@ async def board_add(inter: discord.Interaction, a: int = 0, b: int = 0):
 async def board_edit(inter: discord.Interaction, round_no: int, a: Optional[int] = None, b: Optional[int] = None):
     await inter.response.defer(thinking=True, ephemeral=True)
     board = get_board(inter)
-    if not board or not board.rounds:
+    if not board or not board.rounds_a:
         await inter.followup.send("このチャンネルにはボードがありません。/board_start で作成してください。", ephemeral=True)
         return
-    if round_no < 1 or round_no > len(board.rounds):
-        await inter.followup.send(f"ラウンド {round_no} は存在しません。現在の最大ラウンドは {len(board.rounds)} です。", ephemeral=True)
+    if round_no < 1 or round_no > len(board.rounds_a):
+        await inter.followup.send(f"ラウンド {round_no} は存在しません。現在の最大ラウンドは {len(board.rounds_a)} です。", ephemeral=True)
         return
 
-    r = board.rounds[round_no - 1]
+    i = round_no - 1
+    if (a is None or a == board.rounds_a[i]) and (b is None or b == board.rounds_b[i]):
+        # 変更なし: 再描画も保存もしない
+        await inter.followup.send(f"ラウンド {round_no} は変更ありません。 A={board.rounds_a[i]} B={board.rounds_b[i]}", ephemeral=True)
+        return
     if a is not None:
-        r.a = a
+        board.ta += a - board.rounds_a[i]
+        board.rounds_a[i] = a
     if b is not None:
-        r.b = b
+        board.tb += b - board.rounds_b[i]
+        board.rounds_b[i] = b
+    board.invalidate()
 
-    try:
-        msg = await inter.channel.fetch_message(board.message_id)
-        await msg.edit(content=board.render())
-    except discord.NotFound:
-        msg = await inter.channel.send(board.render())
-        board.message_id = msg.id
+    schedule_edit(inter, board)
     save_board(inter, board)
-    await inter.followup.send(f"ラウンド {round_no} を修正しました。 A={r.a} B={r.b}", ephemeral=True)
+    await inter.followup.send(f"ラウンド {round_no} を修正しました。 A={board.rounds_a[i]} B={board.rounds_b[i]}", ephemeral=True)
 
 @tree.command(name="board_undo", description="Remove the last round")
 async def board_undo(inter: discord.Interaction):
     await inter.response.defer(thinking=True, ephemeral=True)
     board = get_board(inter)
-    if not board or not board.rounds:
+    if not board or not board.rounds_a:
         await inter.followup.send("取り消すラウンドがありません。", ephemeral=True)
         return
-    board.rounds.pop()
-    try:
-        msg = await inter.channel.fetch_message(board.message_id)
-        await msg.edit(content=board.render())
-    except discord.NotFound:
-        msg = await inter.channel.send(board.render())
-        board.message_id = msg.id
+    board.ta -= board.rounds_a.pop()
+    board.tb -= board.rounds_b.pop()
+    board.invalidate()
+    schedule_edit(inter, board)
     save_board(inter, board)
     await inter.followup.send("最後のラウンドを取り消しました。", ephemeral=True)
 
@@ -302,16 +571,34 @@ async def board_show(inter: discord.Interaction):
     if not board:
         await inter.followup.send("このチャンネルにはボードがありません。/board_start で作成してください。", ephemeral=True)
         return
+    # Let a pending debounced edit finish first (it may re-send a deleted message),
+    # then respect the same EDIT_INTERVAL throttle.
+    task = board._pending_render_task
+    if task is not None and not task.done():
+        await asyncio.wait({task})
+    delay = EDIT_INTERVAL - (time.monotonic() - board._last_edit_ts)
+    if delay > 0:
+        await asyncio.sleep(delay)
+    if get_board(inter) is not board:  # deleted while waiting
+        await inter.followup.send("このチャンネルにはボードがありません。/board_start で作成してください。", ephemeral=True)
+        return
+    board._last_edit_ts = time.monotonic()  # edits scheduled meanwhile wait for this one
+
+    # Always PATCH here (no _last_sent_content skip): a deleted message must surface as NotFound
+    content = board.render()
     try:
         if board.message_id:
-            msg = await inter.channel.fetch_message(board.message_id)
-            await msg.edit(content=board.render())
+            await inter.channel.get_partial_message(board.message_id).edit(content=content)
+            board._last_sent_content = content
+            board._last_edit_ts = time.monotonic()
             await inter.followup.send("ボードを更新しました。", ephemeral=True)
             return
     except discord.NotFound:
         pass
-    msg = await inter.channel.send(board.render())
+    msg = await inter.channel.send(content)
     board.message_id = msg.id
+    board._last_sent_content = content
+    board._last_edit_ts = time.monotonic()
     save_board(inter, board)
     await inter.followup.send("ボードを再表示しました。", ephemeral=True)
 
@@ -333,27 +620,33 @@ async def board_rename(
         await inter.followup.send("このチャンネルにはボードがありません。/board_start で作成してください。", ephemeral=True)
         return
 
+    # 両方検証してから反映（キャッシュ上のボードを途中で書き換えない）
+    va = vb = None
     if player_a is not None:
         va = Board._validate_name(player_a)
         if va is None:
             await inter.followup.send("player_a は半角ASCIIのみ（最大8文字）。全角は不可です。", ephemeral=True)
             return
-        board.player_a = va
     if player_b is not None:
         vb = Board._validate_name(player_b)
         if vb is None:
             await inter.followup.send("player_b は半角ASCIIのみ（最大8文字）。全角は不可です。", ephemeral=True)
             return
+
+    if (va is None or va == board.player_a) and (vb is None or vb == board.player_b) and (not title or title == board.title):
+        # 変更なし: 再描画も保存もしない
+        await inter.followup.send("名前/タイトルに変更はありません。", ephemeral=True)
+        return
+    if va is not None:
+        board.player_a = va
+    if vb is not None:
         board.player_b = vb
+    board._header_line = None
     if title:
         board.title = title
+    board.invalidate()
 
-    try:
-        msg = await inter.channel.fetch_message(board.message_id)
-        await msg.edit(content=board.render())
-    except discord.NotFound:
-        msg = await inter.channel.send(board.render())
-        board.message_id = msg.id
+    schedule_edit(inter, board)
     save_board(inter, board)
     await inter.followup.send("名前/タイトルを更新しました。", ephemeral=True)
 
@@ -364,13 +657,11 @@ async def board_reset(inter: discord.Interaction):
     if not board:
         await inter.followup.send("このチャンネルにはボードがありません。/board_start で作成してください。", ephemeral=True)
         return
-    board.rounds.clear()
-    try:
-        msg = await inter.channel.fetch_message(board.message_id)
-        await msg.edit(content=board.render())
-    except discord.NotFound:
-        msg = await inter.channel.send(board.render())
-        board.message_id = msg.id
+    del board.rounds_a[:]
+    del board.rounds_b[:]
+    board.ta = board.tb = 0
+    board.invalidate()
+    schedule_edit(inter, board)
     save_board(inter, board)
     await inter.followup.send("ボードをリセットしました。", ephemeral=True)
 
@@ -382,20 +673,20 @@ async def board_delete(inter: discord.Interaction):
         await inter.followup.send("このチャンネルにはボードがありません。", ephemeral=True)
         return
 
-    # メッセージ削除
+    # 保留中の再描画を取り下げ、実行中の編集/再送信が終わるのを待ってからメッセージ削除
+    # (cancel だと再送信の途中で止まり、ID不明のメッセージが残り得る)
+    task = board._pending_render_task
+    if task is not None and not task.done():
+        board._dirty_render = False
+        await asyncio.wait({task})
     if board.message_id:
         try:
-            msg = await inter.channel.fetch_message(board.message_id)
-            await msg.delete()
+            await inter.channel.get_partial_message(board.message_id).delete()
         except discord.NotFound:
             pass
 
-    # JSONから削除
-    data = _load_all()
-    k = _key(inter)
-    if k in data:
-        del data[k]
-        _save_all(data)
+    # キャッシュとJSONから削除
+    drop_board(inter)
 
     await inter.followup.send("ボードを削除しました。/board_start で新規作成できます。", ephemeral=True)
 
@@ -409,19 +700,20 @@ async def board_zero_style(inter: discord.Interaction, style: str):
         return
 
     if style.lower() == "dash":
-        board.zero_as_dash = True
+        zero_as_dash = True
     elif style.lower() == "zero":
-        board.zero_as_dash = False
+        zero_as_dash = False
     else:
         await inter.followup.send("style は 'dash' または 'zero' を指定してください。", ephemeral=True)
         return
+    if zero_as_dash == board.zero_as_dash:
+        # 変更なし: 再描画も保存もしない
+        await inter.followup.send(f"0 の表示方法は既に {'-' if zero_as_dash else '0'} です。", ephemeral=True)
+        return
+    board.zero_as_dash = zero_as_dash
+    board.invalidate()
 
-    try:
-        msg = await inter.channel.fetch_message(board.message_id)
-        await msg.edit(content=board.render())
-    except discord.NotFound:
-        msg = await inter.channel.send(board.render())
-        board.message_id = msg.id
+    schedule_edit(inter, board)
     save_board(inter, board)
 
     await inter.followup.send(f"0 の表示方法を {'-' if board.zero_as_dash else '0'} に切り替えました。", ephemeral=True)
@@ -462,8 +754,20 @@ async def board_help(inter: discord.Interaction):
 
 # ------------------ Client lifecycle ------------------
 
+def _install_signal_handlers():
+    # SIGTERM (systemd/docker stop) skips atexit; close the client instead so client.run
+    # returns normally and _shutdown flushes + checkpoints pending writes.
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.ensure_future(client.close()))
+    except (NotImplementedError, RuntimeError):
+        pass  # no loop signal handlers (e.g. Windows)
+
 @client.event
 async def on_ready():
+    _ensure_loaded()
+    _start_flusher()
+    _install_signal_handlers()
     try:
         synced = await tree.sync()
         print(f"Synced {len(synced)} commands")